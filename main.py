@@ -16,7 +16,15 @@
 
 import pygame
 import sys
-import random
+import functools
+import numpy as np
+from scipy.ndimage import convolve
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 pygame.init() # Initialize Pygame
 
@@ -26,6 +34,7 @@ ACTIVE_CELL_COLOR = (0, 255, 0)
 TEXT_COLOR = (0, 255, 0)
 CELL_BORDER_COLOR = (50, 50, 50)
 SPEED = 5
+FPS = 60 # Drawing and input run at this rate; the simulation steps at SPEED generations per second
 WIDTH, HEIGHT = 960, 720
 
 base_font_size = 15
@@ -49,14 +58,60 @@ font = pygame.font.SysFont("monospace", base_font_size)
 title_font = pygame.font.SysFont("monospace", title_font_size)
 about_font = pygame.font.SysFont("monospace", about_font_size)
 
+# Precomputed rects for the buttons, which never move
+main_buttons_x = (WIDTH - (4 * button_width + 3 * margin)) // 2
+MAIN_BUTTON_RECTS = [pygame.Rect(main_buttons_x + i * (button_width + margin), 50, button_width, button_height)
+                     for i in range(4)]
+speed_buttons_y = grid_offset_y + 3 * (base_font_size + 10) + 20
+SPEED_BUTTON_RECTS = [pygame.Rect(grid_offset_x - 150, speed_buttons_y + i * (button_height + margin), button_width, button_height)
+                      for i in range(2)]
+
+# Surfaces and palette for rendering the whole grid in one blit
+PALETTE = np.array([BACKGROUND_COLOR, ACTIVE_CELL_COLOR], dtype=np.uint8)
+grid_surface = pygame.Surface((grid_width, grid_height))
+border_overlay = pygame.Surface((grid_width, grid_height), pygame.SRCALPHA)
+for row in range(rows):
+    for col in range(cols):
+        pygame.draw.rect(border_overlay, CELL_BORDER_COLOR,
+                         pygame.Rect(col * cell_size, row * cell_size, cell_size, cell_size), 1)
+
+# Convolution kernel that sums the 8 neighboring cells of each cell
+KERNEL = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=np.uint8)
+
+# Next state indexed by alive * 9 + neighbor count: dead cells need exactly 3 neighbors, live cells 2 or 3
+RULE = np.array([0, 0, 0, 1, 0, 0, 0, 0, 0,
+                 0, 0, 1, 1, 0, 0, 0, 0, 0], dtype=np.uint8)
+
+# On large boards without Numba, count neighbors with FFT convolution, which beats the direct stencil past ~256x256
+FFT_THRESHOLD = 256 * 256
+USE_FFT = not NUMBA_AVAILABLE and rows * cols >= FFT_THRESHOLD
+if USE_FFT:
+    kernel_padded = np.zeros((rows, cols))
+    kernel_padded[:3, :3] = KERNEL
+    KERNEL_FT = np.fft.rfft2(np.roll(np.roll(kernel_padded, -1, axis=0), -1, axis=1))
+
+# Precomputed wraparound row and column indices for neighbor lookups
+UP = np.array([(r - 1) % rows for r in range(rows)])
+DOWN = np.array([(r + 1) % rows for r in range(rows)])
+LEFT = np.array([(c - 1) % cols for c in range(cols)])
+RIGHT = np.array([(c + 1) % cols for c in range(cols)])
+
+# Random number generator for randomizing the grid
+rng = np.random.default_rng()
+
 # Game state
-grid = [[0 for _ in range(cols)] for _ in range(rows)]
-initial_grid = [[0 for _ in range(cols)] for _ in range(rows)]
+grid = np.zeros((rows, cols), dtype=np.uint8)
+spare_grid = np.zeros((rows, cols), dtype=np.uint8) # Second buffer swapped with grid each generation
+initial_grid = np.zeros((rows, cols), dtype=np.uint8)
+neighbor_counts = np.empty((rows, cols), dtype=np.uint8)
+prev_grid = np.full((rows, cols), 255, dtype=np.uint8) # Last drawn state; 255 forces a full first draw
 is_playing = False
 clock = pygame.time.Clock()
 
 play_button_text = "Play"
 generation_count = 0
+live_cells = 0 # Maintained by update_grid and the input handlers instead of recounted every frame
+last_info = None # Last (generation, live cells, speed) drawn on the info panel
 
 about_message = "Conway's Game of Life is a cellular automaton with simple rules that can lead to complex, organic-like patterns."
 footer_message = "Version 1.0 - © 2024 Michael Rutherford. Licensed under GNU GPL v3"
@@ -67,53 +122,48 @@ def create_grid():
 
 # Function to update the initial grid with current grid values
 def update_initial_grid():
-    global initial_grid
-    initial_grid = [[grid[row][col] for col in range(cols)] for row in range(rows)]
+    initial_grid[:] = grid
 
-# Function to draw the entire grid on the screen
+# Function to draw the grid as a single surface, rebuilt only when it changed
 def draw_grid():
-    for row in range(rows):
-        for col in range(cols):
-            draw_cell(row, col)
-
-# Function to draw a single cell at a specific row and column
-def draw_cell(row, col):
-    cell_x = grid_offset_x + col * cell_size
-    cell_y = grid_offset_y + row * cell_size
-    cell_rect = pygame.Rect(cell_x, cell_y, cell_size, cell_size)
-    color = ACTIVE_CELL_COLOR if grid[row][col] else BACKGROUND_COLOR
-    pygame.draw.rect(screen, color, cell_rect)
-    pygame.draw.rect(screen, CELL_BORDER_COLOR, cell_rect, 1)
-
-# Function to count the number of live neighbors for a specific cell
-def count_neighbors(row, col):
-    count = 0
-    for i in range(-1, 2):
-        for j in range(-1, 2):
-            if i == 0 and j == 0:
-                continue
-            r = (row + i) % rows
-            c = (col + j) % cols
-            count += grid[r][c]
-    return count
+    if np.array_equal(grid, prev_grid):
+        return
+    cells = np.repeat(np.repeat(grid.T, cell_size, axis=0), cell_size, axis=1) # Upscale to pixel resolution
+    pygame.surfarray.blit_array(grid_surface, PALETTE[cells])
+    screen.blit(grid_surface, (grid_offset_x, grid_offset_y))
+    screen.blit(border_overlay, (grid_offset_x, grid_offset_y))
+    prev_grid[:] = grid
+
+# Function to compute one generation from g into out using precomputed wrap indices
+def _step(g, out, up, down, left, right):
+    live = 0
+    for r in range(g.shape[0]):
+        for c in range(g.shape[1]):
+            n = (g[up[r], left[c]] + g[up[r], c] + g[up[r], right[c]]
+                 + g[r, left[c]] + g[r, right[c]]
+                 + g[down[r], left[c]] + g[down[r], c] + g[down[r], right[c]])
+            out[r, c] = RULE[g[r, c] * 9 + n]
+            live += out[r, c]
+    return live
+
+if NUMBA_AVAILABLE:
+    _step = njit(cache=True)(_step)
+    _step(grid, spare_grid, UP, DOWN, LEFT, RIGHT) # Warm up the JIT so the first generation isn't delayed
 
 # Function to update the grid based on the game's rules
 def update_grid():
-    global grid, generation_count, is_playing, play_button_text
+    global grid, spare_grid, generation_count, live_cells, is_playing, play_button_text
     if generation_count < 99999:
-        new_grid = [[0 for _ in range(cols)] for _ in range(rows)]
-        for row in range(rows):
-            for col in range(cols):
-                neighbors = count_neighbors(row, col)
-                if grid[row][col] == 1:
-                    if neighbors < 2 or neighbors > 3:
-                        new_grid[row][col] = 0
-                    else:
-                        new_grid[row][col] = 1
-                else:
-                    if neighbors == 3:
-                        new_grid[row][col] = 1
-        grid = new_grid
+        if NUMBA_AVAILABLE:
+            live_cells = int(_step(grid, spare_grid, UP, DOWN, LEFT, RIGHT))
+        else:
+            if USE_FFT:
+                neighbors = np.rint(np.fft.irfft2(np.fft.rfft2(grid) * KERNEL_FT, s=(rows, cols))).astype(np.uint8)
+            else:
+                neighbors = convolve(grid, KERNEL, mode='wrap', output=neighbor_counts)
+            spare_grid[:] = RULE[grid * 9 + neighbors]
+            live_cells = int(spare_grid.sum())
+        grid, spare_grid = spare_grid, grid
         generation_count += 1
     else:
         is_playing = False
@@ -121,10 +171,9 @@ def update_grid():
 
 # Function to clear or reset the grid based on the reset variable
 def clear_or_reset_grid(reset=False):
-    global grid, is_playing, play_button_text, generation_count
-    for row in range(rows):
-        for col in range(cols):
-            grid[row][col] = initial_grid[row][col] if reset else 0
+    global is_playing, play_button_text, generation_count, live_cells
+    grid[:] = initial_grid if reset else 0
+    live_cells = int(grid.sum())
     is_playing = False
     play_button_text = "Play"
     generation_count = 0
@@ -139,10 +188,9 @@ def reset_grid():
 
 # Function to randomize the grid with live and dead cells
 def randomize_grid():
-    global grid
-    for row in range(rows):
-        for col in range(cols):
-            grid[row][col] = random.choice([0, 1])
+    global live_cells
+    grid[:] = rng.integers(0, 2, size=(rows, cols), dtype=np.uint8)
+    live_cells = int(grid.sum())
 
 # Function to increase the game speed
 def handle_toggle_speed_increase():
@@ -154,56 +202,45 @@ def handle_toggle_speed_decrease():
     global SPEED
     SPEED = max(SPEED- 1, 1)
 
-# Function to draw buttons on the screen with given texts
-def draw_buttons(button_texts, x_start, y_pos):
-    button_rects = []
-    for i, text in enumerate(button_texts):
-        text_surface = font.render(text, True, TEXT_COLOR)
+# Function to render text in the given font, caching the resulting surfaces
+@functools.lru_cache(maxsize=256)
+def render_text(text, text_font):
+    return text_font.render(text, True, TEXT_COLOR)
+
+# Function to draw buttons on the screen with given texts and rects
+def draw_buttons(button_texts, button_rects):
+    for text, button_rect in zip(button_texts, button_rects):
+        text_surface = render_text(text, font)
         text_rect = text_surface.get_rect()
-        button_rect = pygame.Rect(x_start + i * (button_width + margin), y_pos, button_width, button_height)
         pygame.draw.rect(screen, BACKGROUND_COLOR, button_rect)
         screen.blit(text_surface, (button_rect.centerx - text_rect.width // 2, button_rect.centery - text_rect.height // 2))
         pygame.draw.line(screen, CELL_BORDER_COLOR, (button_rect.left, button_rect.bottom), (button_rect.right, button_rect.bottom), 1)
-        button_rects.append(button_rect)
     return button_rects
 
 # Function to draw the main buttons (Play, Clear, Reset, Randomize)
 def draw_main_buttons():
-    button_texts = [play_button_text, "Clear", "Reset", "Randomize"]
-    x_start = (WIDTH - (len(button_texts) * button_width + (len(button_texts) - 1) * margin)) // 2
-    return draw_buttons(button_texts, x_start, 50)
+    return draw_buttons([play_button_text, "Clear", "Reset", "Randomize"], MAIN_BUTTON_RECTS)
 
 # Function to draw the speed buttons (Faster, Slower)
 def draw_speed_buttons():
-    button_texts = ["Faster", "Slower"]
-    info_x = grid_offset_x - 150
-    info_y_start = grid_offset_y + 3 * (base_font_size + 10) + 20
-    button_rects = []
-    for i, text in enumerate(button_texts):
-        text_surface = font.render(text, True, TEXT_COLOR)
-        text_rect = text_surface.get_rect()
-        button_rect = pygame.Rect(info_x, info_y_start + i * (button_height + margin), button_width, button_height)
-        pygame.draw.rect(screen, BACKGROUND_COLOR, button_rect)
-        screen.blit(text_surface, (button_rect.centerx - text_rect.width // 2, button_rect.centery - text_rect.height // 2))
-        pygame.draw.line(screen, CELL_BORDER_COLOR, (button_rect.left, button_rect.bottom), (button_rect.right, button_rect.bottom), 1)
-        button_rects.append(button_rect)
-    return button_rects
+    return draw_buttons(["Faster", "Slower"], SPEED_BUTTON_RECTS)
+
+# Static text surfaces, rendered once at startup
+title_surface = title_font.render("Conway's Game of Life", True, TEXT_COLOR)
+title_rect = title_surface.get_rect(center=(WIDTH // 2, 20))
+footer_surface = about_font.render(footer_message, True, TEXT_COLOR)
+footer_rect = footer_surface.get_rect(midbottom=(WIDTH // 2, HEIGHT - 5))
 
 # Function to draw the title on the screen
 def draw_title():
-    title_text = "Conway's Game of Life"
-    text_surface = title_font.render(title_text, True, TEXT_COLOR)
-    text_rect = text_surface.get_rect(center=(WIDTH // 2, 20))
-    screen.blit(text_surface, text_rect)
+    screen.blit(title_surface, title_rect)
 
 # Function to draw the footer message on the screen
 def draw_footer():
-    text_surface = about_font.render(footer_message, True, TEXT_COLOR)
-    text_rect = text_surface.get_rect(midbottom=(WIDTH // 2, HEIGHT - 5))
-    screen.blit(text_surface, text_rect)
+    screen.blit(footer_surface, footer_rect)
 
-# Function to draw the about panel with game information
-def draw_about_panel():
+# Function to build the about panel surface, composed once at startup
+def build_about_surface():
     about_message = (
         "Conway's Game of Life is a cellular automaton with simple rules that can lead to complex, organic-like patterns.\n\n"
         "The game takes place on a 2-D grid of cells that are either alive or dead and evolve based on the game's rules.\n\n"
@@ -234,29 +271,41 @@ def draw_about_panel():
     for idx, line in enumerate(wrapped_lines):
         text = about_font.render(line, True, TEXT_COLOR)
         text_surface.blit(text, (0, idx * about_font.get_linesize() * line_spacing))
-    text_rect = text_surface.get_rect(topleft=(grid_offset_x + grid_width + 10, grid_offset_y))
-    screen.blit(text_surface, text_rect)
+    return text_surface
+
+about_surface = build_about_surface()
+
+# Function to draw the about panel with game information
+def draw_about_panel():
+    screen.blit(about_surface, (grid_offset_x + grid_width + 10, grid_offset_y))
 
 # Function to draw the information panel with game statistics
 def draw_info_panel(generation_count, live_cells, SPEED):
+    global last_info
+    if (generation_count, live_cells, SPEED) == last_info:
+        return
+    last_info = (generation_count, live_cells, SPEED)
     info_x = grid_offset_x - 160
     info_y_start = grid_offset_y
+    screen.fill(BACKGROUND_COLOR, (info_x, info_y_start, 155, 3 * (base_font_size + 10)))
     info_texts = [
         f"Generation: {generation_count}",
         f"Live Cells: {live_cells}",
         f"Speed: {SPEED}"
     ]
     for i, text in enumerate(info_texts):
-        text_surface = font.render(text, True, TEXT_COLOR)
+        text_surface = render_text(text, font)
         text_rect = text_surface.get_rect(topleft=(info_x, info_y_start + i * (base_font_size + 10)))
         screen.blit(text_surface, text_rect)
 
 # Function to handle mouse click events on the grid and buttons
 def handle_mouse_click(x, y, button_rects1, speed_button_rects):
+    global live_cells
     if grid_offset_x <= x < grid_offset_x + grid_width and grid_offset_y <= y < grid_offset_y + grid_height:
         col = (x - grid_offset_x) // cell_size
         row = (y - grid_offset_y) // cell_size
-        grid[row][col] = 1 if grid[row][col] == 0 else 0
+        grid[row, col] = 1 if grid[row, col] == 0 else 0
+        live_cells = int(grid.sum())
         update_initial_grid()
     else:
         handle_button_click(x, y, button_rects1, speed_button_rects)
@@ -287,14 +336,16 @@ def toggle_play():
     play_button_text = "Pause" if is_playing else "Play"
 
 create_grid() # Set up initial grid
+screen.fill(BACKGROUND_COLOR)
+draw_title() # The title, about panel, and footer never change, so draw them once
+draw_about_panel()
+draw_footer()
+last_step_ms = 0 # Time of the last simulation step
 
 # Main loop
 while True:
-    screen.fill(BACKGROUND_COLOR)
     draw_grid()
-    draw_title()
     button_rects = draw_main_buttons()
-    live_cells = sum(sum(row) for row in grid) # Count the number of live cells on the grid
     draw_info_panel(generation_count, live_cells, SPEED)
     speed_button_rects = draw_speed_buttons()
 
@@ -305,10 +356,10 @@ while True:
         elif event.type == pygame.MOUSEBUTTONDOWN:
             handle_mouse_click(event.pos[0], event.pos[1], button_rects, speed_button_rects)
     
-    if is_playing:
+    now = pygame.time.get_ticks()
+    if is_playing and now - last_step_ms >= 1000 // SPEED:
         update_grid()
+        last_step_ms = now
 
-    draw_about_panel()
-    draw_footer()
     pygame.display.flip() # Updates the full display to the screen
-    clock.tick(SPEED)
\ No newline at end of file
+    clock.tick(FPS)
\ No newline at end of file